@@ -0,0 +1,25 @@
+# Load aggregation for the building/home simulation
+import numpy as np
+
+# --- AGGREGATION ---
+
+def aggregate_loads(S, power, variation, var_row, sub_idx, n_sub):
+    """
+    Scales each load's row of S by its power rating and variation, sums the loads of each subsystem and adds a total.
+    S: (loads, time steps) schedules (0/1), or dense kW profiles with power 1
+    power: (loads,) power ratings (kW)
+    variation: (n, time steps) multipliers; var_row[i] is the row used by load i (-1: no variation)
+    sub_idx: (loads,) subsystem index of each load, in [0, n_sub)
+    Returns the column-major (time steps, n_sub + 1) matrix of subsystem loads, with the total in the last column.
+    """
+    block = power[:, None] * S
+    rows = np.flatnonzero(var_row >= 0)
+    if len(rows):
+        block[rows] *= variation[var_row[rows]]
+    out = np.zeros((n_sub + 1, S.shape[1]))
+    if len(np.unique(sub_idx)) == len(sub_idx):
+        out[sub_idx] = block
+    else:
+        np.add.at(out, sub_idx, block)
+    out[-1] = out[:-1].sum(axis=0)
+    return out.T
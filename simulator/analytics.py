@@ -1,5 +1,9 @@
+from collections import namedtuple
+import numpy as np
 import pandas as pd
 
+NIGHT_HVAC_WARNING = "High night-time HVAC consumption detected."
+
 # --- ANALYTICS FUNCTIONS ---
 
 def find_peak_load(df):
@@ -7,10 +11,24 @@ def find_peak_load(df):
     Identify the hour and subsystem with the peak load.
     Returns (hour, subsystem, value).
     """
-    peak_hour = df['Total'].idxmax()
-    peak_value = df['Total'].max()
-    subsystem = df.loc[peak_hour].drop('Total').idxmax()
-    return peak_hour, subsystem, peak_value
+    # argmax on array views rather than building a Series for the peak row
+    total = df['Total'].to_numpy()
+    step = int(total.argmax())
+    others = df.columns != 'Total'
+    subsystem = df.columns[others][df.to_numpy()[step, others].argmax()]
+    return df.index[step], subsystem, total[step]
+
+
+def _prep(df, timestep_hours=1.0):
+    """
+    Column sums shared by subsystem_share and solar_offset_pct.
+    Returns (col_sums, cons_mask, total_demand): per-column sums, mask of the consumption subsystems
+    (positive sum, excluding 'Total' and generation like 'Solar') and their total demand in kWh.
+    """
+    col_sums = df.sum()
+    cons_mask = ~col_sums.index.isin(['Total', 'Solar']) & (col_sums > 0)
+    total_demand = col_sums[cons_mask].sum() * timestep_hours
+    return col_sums, cons_mask, total_demand
 
 
 def subsystem_share(df, timestep_hours=1.0):
@@ -18,12 +36,9 @@ def subsystem_share(df, timestep_hours=1.0):
     Returns % share of total energy per consumption subsystem (excluding 'Total' and generation like 'Solar').
     Energy is in kWh, accounting for time step.
     """
-    # Only include positive (consumption) subsystems, exclude 'Solar'
-    consumption_cols = [col for col in df.columns if col not in ['Total', 'Solar'] and df[col].sum() > 0]
-    # Total demand in kWh
-    total_demand = df[consumption_cols].sum().sum() * timestep_hours
+    col_sums, cons_mask, total_demand = _prep(df, timestep_hours)
     # Share per subsystem
-    shares = df[consumption_cols].sum() * timestep_hours / total_demand * 100 if total_demand > 0 else 0
+    shares = col_sums[cons_mask] * timestep_hours / total_demand * 100 if total_demand > 0 else 0
     return shares
 
 
@@ -34,35 +49,68 @@ def solar_offset_pct(df, timestep_hours=1.0):
     """
     if 'Solar' not in df.columns:
         return 0
-    # Only include positive (consumption) subsystems, exclude 'Solar'
-    consumption_cols = [col for col in df.columns if col not in ['Total', 'Solar'] and df[col].sum() > 0]
-    total_demand = df[consumption_cols].sum().sum() * timestep_hours
+    col_sums, cons_mask, total_demand = _prep(df, timestep_hours)
     # Solar generation (make positive)
-    solar_gen = -df['Solar'].sum() * timestep_hours
+    solar_gen = -col_sums['Solar'] * timestep_hours
     return solar_gen / total_demand * 100 if total_demand > 0 else 0
 
 
 def flag_inefficiencies(df, night_hours=range(0,7)):
     """
     Flags inefficiencies like high night-time HVAC draw.
-    Returns list of warnings.
+    Returns a frozenset of warnings.
     """
-    warnings = []
+    warnings = set()
     if 'HVAC' in df.columns:
         night_hvac = df.loc[night_hours, 'HVAC'].sum()
         if night_hvac > 0.1 * df['HVAC'].sum():
-            warnings.append("High night-time HVAC consumption detected.")
-    return warnings
+            warnings.add(NIGHT_HVAC_WARNING)
+    return frozenset(warnings)
+
+
+# Result of analyze_all: shares is a dict of % per consumption subsystem, has_solar tells if any
+# solar was generated and warnings is a frozenset as returned by flag_inefficiencies
+AnalyticsResult = namedtuple('AnalyticsResult', 'peak_step peak_subsystem peak_value shares solar_pct has_solar warnings total_demand_kwh')
+
+
+def analyze_all(arr, cols, timestep_hours=1.0, night_hours=range(0,7)):
+    """
+    Fused find_peak_load, subsystem_share, solar_offset_pct and flag_inefficiencies on the raw
+    (time steps x columns) matrix of a simulation result: one column-sum reduction shared by all four,
+    plus one Total argmax and a night-row slice.
+    cols maps each column name to its position in arr (must include 'Total').
+    Returns an AnalyticsResult.
+    """
+    names = sorted(cols, key=cols.get)
+    col_sums = arr.sum(axis=0)
+    is_total = np.array([c == 'Total' for c in names])
+    # Consumption subsystems: positive energy, excluding 'Total' and generation like 'Solar'
+    is_consumption = np.array([c not in ('Total', 'Solar') for c in names]) & (col_sums > 0)
+    # Peak load: time step of the highest Total and the largest subsystem at that step
+    total = arr[:, cols['Total']]
+    peak_step = int(total.argmax())
+    peak_value = float(total[peak_step])
+    peak_subsystem = names[int(np.where(is_total, -np.inf, arr[peak_step]).argmax())]
+    total_demand = float(col_sums[is_consumption].sum()) * timestep_hours
+    shares = {names[i]: col_sums[i] * timestep_hours / total_demand * 100 for i in np.flatnonzero(is_consumption)} if total_demand > 0 else {}
+    solar_pct = 0
+    has_solar = 'Solar' in cols and col_sums[cols['Solar']] != 0
+    if 'Solar' in cols and total_demand > 0:
+        solar_pct = -col_sums[cols['Solar']] * timestep_hours / total_demand * 100
+    warnings = set()
+    if 'HVAC' in cols:
+        if arr[list(night_hours), cols['HVAC']].sum() > 0.1 * col_sums[cols['HVAC']]:
+            warnings.add(NIGHT_HVAC_WARNING)
+    return AnalyticsResult(peak_step, peak_subsystem, peak_value, shares, solar_pct, has_solar, frozenset(warnings), total_demand)
 
 # --- EXAMPLE TEST ---
 if __name__ == "__main__":
-    from simulator import BuildingSimulator
-    import numpy as np
+    from .simulator import BuildingSimulator
+    from .models.hvac import HVACLoad
+    from .models.lighting import LightingLoad
+    from .models.appliances import ApplianceLoad
     np.random.seed(42)
     sim = BuildingSimulator()
-    from models.hvac import HVACLoad
-    from models.lighting import LightingLoad
-    from models.appliances import ApplianceLoad
     sim.add_load(HVACLoad("AC", 3, [0]*6 + [1]*2 + [0]*6 + [1]*4 + [0]*6), 'HVAC')
     sim.add_load(LightingLoad("Living Room", 0.2, [0]*17 + [1]*4 + [0]*3), 'Lighting')
     sim.add_load(ApplianceLoad("Fridge", 0.15, [1]*24), 'Appliances')
@@ -71,4 +119,6 @@ if __name__ == "__main__":
     print("Peak load:", find_peak_load(df))
     print("Subsystem share (%):\n", subsystem_share(df, 1.0))
     print("Solar offset %:", solar_offset_pct(df, 1.0))
-    print("Inefficiency flags:", flag_inefficiencies(df)) 
\ No newline at end of file
+    print("Inefficiency flags:", flag_inefficiencies(df))
+    r = sim.result
+    print("All analytics:", analyze_all(r.matrix, {c: i for i, c in enumerate(r.names)}, r.timestep)) 
\ No newline at end of file
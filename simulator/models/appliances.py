@@ -15,16 +15,23 @@ class ApplianceLoad:
         """
         self.name = name
         self.power_kw = power_kw
-        self.schedule = np.array(schedule)
+        schedule = np.asarray(schedule)
+        # 0/1 schedules are stored as uint8; continuous profiles (e.g. solar output) keep their float dtype
+        if schedule.dtype.kind in 'biu':
+            if schedule.size and (schedule.min() < 0 or schedule.max() > 255):
+                raise ValueError(f"{name}: integer schedule values must be in 0..255")
+            schedule = schedule.astype(np.uint8, copy=False)
+        self.schedule = schedule
         self.randomize = randomize
 
-    def simulate(self):
+    def simulate(self, rng=None):
         """
         Returns the power profile (kW) for each time step, based on the schedule.
+        rng: np.random.Generator for the +/-10% variation (defaults to the global NumPy RNG)
         """
         base = self.power_kw * self.schedule
         if self.randomize:
-            variation = np.random.uniform(0.9, 1.1, size=base.shape)
+            variation = (np.random if rng is None else rng).uniform(0.9, 1.1, size=base.shape)
             base = base * variation
         return base
 
@@ -7,29 +7,39 @@ class HVACLoad:
     Represents an HVAC (Heating, Ventilation, and Air Conditioning) load.
     Power draw is based on outdoor temperature and thermostat setpoint.
     """
-    def __init__(self, name, temperature_profile, setpoint=24, max_power=4.0, alpha=0.1):
+    def __init__(self, name, temperature_profile, setpoint=24, max_power=4.0, alpha=0.1, mode='cool'):
         """
         name: str, name of the HVAC unit
         temperature_profile: array-like, outdoor temperature for each time step (°C)
         setpoint: float, thermostat setpoint (°C)
         max_power: float, maximum power draw (kW)
-        alpha: float, scaling factor for duty cycle per degree above setpoint
+        alpha: float, scaling factor for duty cycle per degree away from setpoint
+        mode: str, 'cool' (runs above setpoint) or 'heat' (runs below setpoint)
         """
         self.name = name
-        self.temperature_profile = np.array(temperature_profile)
+        self.temperature_profile = np.asarray(temperature_profile, dtype=float)
         self.setpoint = setpoint
         self.max_power = max_power
         self.alpha = alpha
+        self.mode = mode
 
-    def simulate(self):
+    def simulate(self, rng=None):
         """
         Returns the power profile (kW) for each time step, based on temperature and setpoint.
         If temperature <= setpoint: power = 0.
         If temperature > setpoint: power = max_power * min(1, alpha * (T_out - setpoint)).
+        In 'heat' mode the same applies below the setpoint, using (setpoint - T_out).
+        rng is accepted for a uniform load interface; HVAC power has no random component.
         """
-        delta = self.temperature_profile - self.setpoint
-        duty_cycle = np.clip(self.alpha * delta, 0, 1)
-        return self.max_power * duty_cycle
+        # One output buffer, updated in place: delta -> duty cycle -> power
+        if self.mode == 'heat':
+            out = np.subtract(self.setpoint, self.temperature_profile)
+        else:
+            out = np.subtract(self.temperature_profile, self.setpoint)
+        out *= self.alpha
+        np.clip(out, 0, 1, out=out)
+        out *= self.max_power
+        return out
 
 # Example test data for 24 hours, 1-hour steps
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+# Appliance/lighting schedule builders for the home simulation
+import numpy as np
+
+# Row order of the matrix returned by build_all_schedules
+SCHEDULE_ROWS = ("Lighting", "Dishwasher", "Microwave", "Oven", "Washer", "Dryer", "TV", "Computer", "EV Charger")
+
+# --- EVENT SCATTER ---
+
+def scatter_events(out, day_ptr, rows, steps, steps_per_day):
+    """
+    Sets out[row, day*steps_per_day + step] = 1 for every event.
+    Events are sorted by day; day_ptr[d]:day_ptr[d+1] are the events of day d.
+    """
+    days = np.repeat(np.arange(len(day_ptr) - 1), np.diff(day_ptr))
+    out[rows, days * steps_per_day + steps] = 1
+
+# --- SCHEDULE BUILDERS ---
+
+def random_subset_mask(rows, cols, k, rng):
+    """
+    Boolean (rows, cols) mask with exactly k[r] randomly chosen True entries in row r.
+    rng: np.random.Generator used for the draws.
+    """
+    order = np.argsort(rng.random((rows, cols)), axis=1)
+    mask = np.zeros((rows, cols), dtype=bool)
+    np.put_along_axis(mask, order, np.arange(cols) < np.asarray(k)[:, None], axis=1)
+    return mask
+
+def build_all_schedules(days, steps_per_day, timestep_hours, lighting_factor=1.0, is_weekend=None, rng=None):
+    """
+    Builds the on/off schedules of all scheduled loads in one pass.
+    is_weekend: optional (days,) bool array; defaults to days 5 and 6 of each week.
+    rng: np.random.Generator for the random draws (pass a seeded one for reproducible schedules).
+    Returns an uint8 matrix of shape (len(SCHEDULE_ROWS), days*steps_per_day).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    out = np.zeros((len(SCHEDULE_ROWS), days * steps_per_day), dtype=np.uint8)
+    day_idx = np.arange(days)
+    weekend = (day_idx % 7) >= 5 if is_weekend is None else np.asarray(is_weekend, dtype=bool)
+    # Step index of each clock hour used below, computed once
+    H1, H5, H6, H7, H16, H17, H18, H22, H23 = (int(h / timestep_hours) for h in (1, 5, 6, 7, 16, 17, 18, 22, 23))
+    # Lighting: mornings and evenings, switched on earlier at weekends
+    weekday = np.zeros(steps_per_day, dtype=np.uint8)
+    weekday[H6:H7] = 1
+    weekday[H18:H22] = 1
+    weekend_day = np.zeros(steps_per_day, dtype=np.uint8)
+    weekend_day[H5:H7] = 1
+    weekend_day[H17:H22] = 1
+    light = np.where(weekend[:, None], weekend_day, weekday)
+    out[0] = np.clip((lighting_factor * light + 0.5).astype(np.uint8), 0, 1).ravel()
+    # (row, day, step) of every ON event, collected per appliance
+    events = []
+    # Dishwasher: after dinner daily, after breakfast on half of the weekends
+    dinner_hours = (rng.uniform(19, 21, days) / timestep_hours).astype(int)
+    events.append((1, day_idx, dinner_hours))
+    breakfast_days = weekend & (rng.random(days) < 0.5)
+    breakfast_hours = (rng.uniform(7, 9, days) / timestep_hours).astype(int)
+    events.append((1, day_idx[breakfast_days], breakfast_hours[breakfast_days]))
+    # Microwave: breakfast, lunch and dinner windows, each used with 80% probability
+    meal_hours = (rng.uniform([7, 12, 18], [9, 14, 20], size=(days, 3)) / timestep_hours).astype(int)
+    meal_used = rng.random((days, 3)) < 0.8
+    events.append((2, np.broadcast_to(day_idx[:, None], meal_hours.shape)[meal_used], meal_hours[meal_used]))
+    # Oven: early evening, more likely on weekends
+    oven_days = rng.random(days) < np.where(weekend, 0.5, 0.2)
+    oven_hours = (rng.uniform(17, 20, days) / timestep_hours).astype(int)
+    events.append((3, day_idx[oven_days], oven_hours[oven_days]))
+    # Washer every weekend day and 20% of weekdays, dryer one hour later
+    laundry_days = day_idx[weekend | (rng.random(days) < 0.2)]
+    washer_hours = (rng.uniform(10, 15, len(laundry_days)) / timestep_hours).astype(int)
+    events.append((4, laundry_days, washer_hours))
+    events.append((5, laundry_days, (washer_hours + H1) % steps_per_day))
+    # TV: 2-4 distinct evening hours per day, plus one extra (possibly repeated) hour on weekends
+    evening_hours = np.arange(H18, H23)
+    tv_on = random_subset_mask(days, len(evening_hours), rng.integers(2, 5, size=days), rng)
+    tv_days, tv_cols = np.nonzero(tv_on)
+    events.append((6, tv_days, evening_hours[tv_cols]))
+    extra_hours = evening_hours[rng.integers(0, len(evening_hours), size=days)]
+    events.append((6, day_idx[weekend], extra_hours[weekend]))
+    # Computer: each late-afternoon/evening step on with 50% (weekday) or 20% (weekend) probability
+    comp_start, comp_end = H16, H22
+    comp_prob = np.where(weekend, 0.2, 0.5)[:, None]
+    comp_days, comp_cols = np.nonzero(rng.random((days, comp_end - comp_start)) < comp_prob)
+    events.append((7, comp_days, comp_start + comp_cols))
+    # EV: charged late evening on up to 3 random days
+    ev_days = rng.choice(days, min(3, days), replace=False)
+    ev_hours = (rng.uniform(22, 24, len(ev_days)) / timestep_hours).astype(int)
+    events.append((8, ev_days, ev_hours))
+    rows = np.concatenate([np.full(len(d), r, dtype=np.int64) for r, d, _ in events])
+    event_days = np.concatenate([d for _, d, _ in events]).astype(np.int64)
+    steps = np.concatenate([s for _, _, s in events]).astype(np.int64)
+    order = np.argsort(event_days, kind="stable")
+    day_ptr = np.searchsorted(event_days[order], np.arange(days + 1))
+    scatter_events(out, day_ptr, rows[order], steps[order], steps_per_day)
+    return out
@@ -1,16 +1,29 @@
+from collections import namedtuple
 import numpy as np
 import pandas as pd
 from .models.hvac import HVACLoad
 from .models.lighting import LightingLoad
 from .models.appliances import ApplianceLoad
+from .aggregate import aggregate_loads
 
 # --- SIMULATION ENGINE ---
 
+# Array form of a simulation result: matrix is (time steps x columns), names the column names
+# (subsystems, then 'Total') and timestep the time step in hours
+SimResult = namedtuple('SimResult', 'matrix names timestep')
+
+# Load classes whose simulate() is power_kw * schedule with optional +/-10% variation, so run_array can
+# evaluate them as stacked rows. Exact types only: subclasses may override simulate() and keep their own profile.
+STACKED_LOAD_TYPES = (LightingLoad, ApplianceLoad)
+# Load classes whose simulate() takes the simulator's rng; any other load (user-defined models, subclasses)
+# is called as load.simulate(), the original load interface
+RNG_LOAD_TYPES = (HVACLoad,) + STACKED_LOAD_TYPES
+
 class BuildingSimulator:
     """
     Coordinates all load models, runs simulation, aggregates results.
     """
-    def __init__(self, timestep_hours=1.0, period_hours=24):
+    def __init__(self, timestep_hours=1.0, period_hours=24, rng=None):
         # Time step in hours (e.g., 1.0 for hourly, 0.25 for 15-min)
         self.timestep_hours = timestep_hours
         # Total simulation period in hours (e.g., 24 for 1 day, 168 for 7 days)
@@ -19,6 +32,10 @@ class BuildingSimulator:
         self.timesteps = int(period_hours / timestep_hours)
         # List of (load, subsystem) tuples
         self.loads = []
+        # np.random.Generator for load variation (None: the global NumPy RNG)
+        self.rng = rng
+        # SimResult of the last run
+        self.result = None
 
     def add_load(self, load, subsystem):
         """
@@ -30,22 +47,49 @@ class BuildingSimulator:
         """
         Run the simulation: aggregate all subsystem loads over the simulation period.
         Returns a DataFrame with each subsystem and the total load per time step.
+        The DataFrame is only a view over run_array()'s matrix, which is also kept as .result.
         """
-        data = {}
-        for load, subsystem in self.loads:
-            profile = load.simulate()
-            # Ensure all subsystem arrays are float for correct aggregation
-            if subsystem not in data:
-                data[subsystem] = profile.astype(float)
-            else:
-                data[subsystem] += profile
+        result = self.run_array()
         # Create DataFrame: each column is a subsystem, each row is a time step
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(result.matrix, columns=result.names, copy=False)
         df.index.name = 'Hour'
-        # Add a 'Total' column for total load at each time step
-        df['Total'] = df.sum(axis=1)
         return df
 
+    def run_array(self):
+        """
+        Run the simulation without building a DataFrame. Returns (and stores as .result) a SimResult.
+        Scheduled loads (exactly LightingLoad or ApplianceLoad, see STACKED_LOAD_TYPES) are evaluated together:
+        their schedules are stacked into one (loads x time steps) matrix and scaled by the power ratings and by a
+        single block of +/-10% variation draws (same draws, in the same order, as calling each load's simulate())
+        in one aggregate_loads pass. Other loads (HVAC) compute their own profile.
+        """
+        if not self.loads:
+            # No subsystems: an empty result with only the 'Total' column
+            self.result = SimResult(np.zeros((0, 1)), ['Total'], self.timestep_hours)
+            return self.result
+        subsystems = list(dict.fromkeys(subsystem for _, subsystem in self.loads))
+        sub_idx = np.array([subsystems.index(subsystem) for _, subsystem in self.loads])
+        # One row per load: the schedule of scheduled loads, the simulated kW profile (power 1) of the others
+        S = np.empty((len(self.loads), self.timesteps))
+        power = np.ones(len(self.loads))
+        var_row = np.full(len(self.loads), -1)
+        for i, (load, _) in enumerate(self.loads):
+            if type(load) in STACKED_LOAD_TYPES:
+                S[i] = load.schedule
+                power[i] = load.power_kw
+                if load.randomize:
+                    var_row[i] = var_row.max() + 1
+            elif type(load) in RNG_LOAD_TYPES:
+                S[i] = load.simulate(rng=self.rng)
+            else:
+                S[i] = load.simulate()
+        n_var = var_row.max() + 1
+        variation = (np.random if self.rng is None else self.rng).uniform(0.9, 1.1, size=(n_var, self.timesteps)) if n_var else np.ones((0, self.timesteps))
+        # Column-major, the layout pandas uses for its blocks, so per-column reductions stay contiguous
+        values = aggregate_loads(S, power, variation, var_row, sub_idx, len(subsystems))
+        self.result = SimResult(values, subsystems + ['Total'], self.timestep_hours)
+        return self.result
+
 # --- EXAMPLE TEST ---
 if __name__ == "__main__":
     np.random.seed(42)
@@ -59,4 +103,15 @@ if __name__ == "__main__":
     sim.add_load(ApplianceLoad("Pump", 4, [0]*6 + [1]*12 + [0]*6), 'Appliances')
     sim.add_load(ApplianceLoad("Computer", 0.5, [0]*8 + [1]*10 + [0]*6), 'Appliances')
     df = sim.run()
-    print(df) 
\ No newline at end of file
+    print(df)
+    # Custom load models only need simulate(self) returning one kW value per time step
+    class ConstantLoad:
+        def __init__(self, power_kw, timesteps):
+            self.power_kw = power_kw
+            self.timesteps = timesteps
+        def simulate(self):
+            return np.full(self.timesteps, self.power_kw)
+    sim.add_load(ConstantLoad(0.3, sim.timesteps), 'Standby')
+    df = sim.run()
+    assert np.allclose(df['Standby'], 0.3)
+    print(df[['Standby', 'Total']]) 
\ No newline at end of file
@@ -0,0 +1,23 @@
+# Outdoor temperature profile builder for the home simulation
+import numpy as np
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# --- TEMPERATURE PROFILE ---
+
+def temperature_profile(day_min, day_max, hours, peak_hour=15.0):
+    """
+    Daily sinusoid between day_min[d] and day_max[d], peaking at peak_hour.
+    day_min, day_max: (days,) arrays; hours: (steps_per_day,) hour of day of each step.
+    Returns a flat (days*steps_per_day,) array; numexpr, when installed, fuses the arithmetic and sin into one pass.
+    """
+    day_min = np.asarray(day_min, dtype=float)[:, None]
+    day_max = np.asarray(day_max, dtype=float)[:, None]
+    hours = np.asarray(hours, dtype=float)
+    dtheta = 2 * np.pi / 24
+    if ne is not None:
+        return ne.evaluate("day_min + (day_max - day_min) * 0.5 * (1 + sin((hours - peak_hour) * dtheta))").ravel()
+    return (day_min + (day_max - day_min) * 0.5 * (1 + np.sin((hours - peak_hour) * dtheta))).ravel()
@@ -1,22 +1,88 @@
+import numpy as np
 import plotly.graph_objs as go
 import plotly.io as pio
 import pandas as pd
 
 pio.templates.default = "plotly_dark"
 
+# Serialize figures (including Dash callback responses) with the C-backed orjson encoder when it is installed
+try:
+    import orjson
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+
+# Figure layouts, validated once at import and shared by every figure built from them
+_TS_LAYOUT = go.Layout(title="Subsystem Energy Usage (Time Series)", xaxis_title="Hour", yaxis_title="kWh")
+_PIE_LAYOUT = go.Layout(title="Subsystem Energy Share (%)")
+_BAR_LAYOUT = go.Layout(title="Total Energy Consumption per Day", xaxis_title="Day", yaxis_title="kWh")
+_SUNBURST_LAYOUT = go.Layout(title="Hierarchical Subsystem Energy Share (Sunburst)")
+
+# Longer time series are downsampled to this many points per trace before plotting
+_TS_MAX_POINTS = 400
+_TS_DOWNSAMPLED_POINTS = 240
+
+# Subsystem hierarchy of the sunburst: (parent, children); subsystems not listed are shown top-level
+GROUPS = (
+    ("HVAC", ("Chiller", "Pump", "Fan")),
+    ("Kitchen", ("Fridge", "Dishwasher", "Microwave", "Oven")),
+    ("Laundry", ("Washer", "Dryer")),
+    ("Entertainment", ("TV", "Computer")),
+    ("EV Charging", ("EV Charger",)),
+)
+# Subsystems that are not drawn as top-level sunburst nodes of their own
+_NOT_TOP_LEVEL = frozenset(["Total", "Solar"]).union(*(children for _, children in GROUPS), (name for name, _ in GROUPS))
+
 # --- VISUALIZATION FUNCTIONS ---
 
+def _lttb(x, y, n_out=240):
+    """
+    Largest-Triangle-Three-Buckets downsampling of each column of y (one row per x) to n_out points.
+    Keeps the first and last points and, per bucket, the point forming the largest triangle with the
+    previously kept point and the next bucket's average, so peaks and troughs survive.
+    Returns an (n_out, columns) array of the row indices kept for each column.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, k = y.shape
+    if n_out >= n or n_out < 3:
+        return np.repeat(np.arange(n)[:, None], k, axis=1)
+    # Bucket i covers rows edges[i]:edges[i+1]; the first and last rows are buckets of their own
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    edges = np.append(edges, n)
+    cols = np.arange(k)
+    idx = np.empty((n_out, k), dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    prev = np.zeros(k, dtype=int)
+    # All columns advance together, one bucket per iteration
+    for i in range(n_out - 2):
+        lo, hi, next_hi = edges[i], edges[i + 1], edges[i + 2]
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean(axis=0)
+        px, py = x[prev], y[prev, cols]
+        area = np.abs((px - avg_x) * (y[lo:hi] - py) - (px - x[lo:hi, None]) * (avg_y - py))
+        prev = lo + area.argmax(axis=0)
+        idx[i + 1] = prev
+    return idx
+
+
 def get_time_series_fig(df):
     """
     Returns a Plotly Figure for time-series of each subsystem.
     Each line shows the power profile (kW) for a subsystem over time.
+    Series longer than _TS_MAX_POINTS steps are downsampled with LTTB.
     """
-    fig = go.Figure()
-    for col in df.columns:
-        if col != 'Total':
-            fig.add_trace(go.Scatter(x=df.index, y=df[col], mode='lines', name=col))
-    fig.update_layout(title="Subsystem Energy Usage (Time Series)", xaxis_title="Hour", yaxis_title="kWh")
-    return fig
+    # All traces built first and handed to the Figure at once (WebGL lines for the long 15-min/7-day series)
+    x = df.index.to_numpy()
+    cols = [col for col in df.columns if col != 'Total']
+    y = df[cols].to_numpy(dtype=np.float32)
+    if len(df) > _TS_MAX_POINTS:
+        # Visually equivalent lines from a fraction of the points
+        idx = _lttb(x, y, _TS_DOWNSAMPLED_POINTS)
+        traces = [go.Scattergl(x=x[idx[:, j]], y=y[idx[:, j], j], mode='lines', name=col) for j, col in enumerate(cols)]
+    else:
+        traces = [go.Scattergl(x=x, y=y[:, j], mode='lines', name=col) for j, col in enumerate(cols)]
+    return go.Figure(data=traces, layout=_TS_LAYOUT)
 
 def get_pie_share_fig(df, timestep_hours=1.0):
     """
@@ -24,24 +90,27 @@ def get_pie_share_fig(df, timestep_hours=1.0):
     Only includes consumption subsystems (positive total energy, not 'Solar').
     Energy is in kWh, accounting for time step.
     """
-    shares = df.drop('Total', axis=1).sum() * timestep_hours
-    shares = shares[(shares > 0) & (shares.index != 'Solar')]
-    fig = go.Figure(go.Pie(labels=shares.index, values=shares.values, hole=0.3))
-    fig.update_layout(title="Subsystem Energy Share (%)")
-    return fig
+    return _pie_fig(df.sum() * timestep_hours)
+
+def _pie_fig(energy):
+    # energy: kWh per column, as a Series indexed by column name
+    shares = energy[(energy > 0) & ~energy.index.isin(['Total', 'Solar'])]
+    values = shares.to_numpy(dtype=np.float32)
+    # Largest slice first, sorted here so plotly.js doesn't have to (sort=False)
+    order = np.argsort(-values, kind='stable')
+    return go.Figure(go.Pie(labels=shares.index.to_numpy()[order], values=values[order], hole=0.3, sort=False), layout=_PIE_LAYOUT)
 
 def get_daily_bar_fig(df, timestep_hours=1.0):
     """
     Returns a Plotly Figure for daily total energy bar chart.
     Energy is in kWh, accounting for time step.
     """
-    df = df.copy()
-    df['Total'] = df['Total'] * timestep_hours  # Convert to kWh per step
-    df['Day'] = (df.index * timestep_hours // 24) + 1
-    daily = df.groupby('Day')['Total'].sum()
-    fig = go.Figure(go.Bar(x=daily.index, y=daily.values))
-    fig.update_layout(title="Total Energy Consumption per Day", xaxis_title="Day", yaxis_title="kWh")
-    return fig
+    # kWh per step, summed per day straight from the Total column (no DataFrame copy or groupby)
+    total = df['Total'].to_numpy() * timestep_hours
+    day = (np.arange(len(total)) * timestep_hours // 24).astype(int)
+    daily = np.bincount(day, weights=total)
+    # float32 is plenty for display and halves the encoded payload
+    return go.Figure(go.Bar(x=np.arange(1, len(daily) + 1), y=daily.astype(np.float32)), layout=_BAR_LAYOUT)
 
 def get_sunburst_share_fig(df, timestep_hours=1.0):
     """
@@ -50,82 +119,58 @@ def get_sunburst_share_fig(df, timestep_hours=1.0):
     Only includes positive (consumption) subsystems, not 'Solar'.
     """
     # Sum energy for each column (kWh)
-    energy = df.sum() * timestep_hours
-    # Build hierarchy
-    labels = []
-    parents = []
-    values = []
-    # HVAC
-    hvac_children = ["Chiller", "Pump", "Fan"]
-    hvac_total = sum(energy[c] for c in hvac_children if c in energy)
-    if hvac_total > 0:
-        labels.append("HVAC"); parents.append(""); values.append(hvac_total)
-        for c in hvac_children:
-            if c in energy and energy[c] > 0:
-                labels.append(c); parents.append("HVAC"); values.append(energy[c])
-    # Kitchen
-    kitchen_children = ["Fridge", "Dishwasher", "Microwave", "Oven"]
-    kitchen_total = sum(energy[c] for c in kitchen_children if c in energy)
-    if kitchen_total > 0:
-        labels.append("Kitchen"); parents.append(""); values.append(kitchen_total)
-        for c in kitchen_children:
-            if c in energy and energy[c] > 0:
-                labels.append(c); parents.append("Kitchen"); values.append(energy[c])
-    # Laundry
-    laundry_children = ["Washer", "Dryer"]
-    laundry_total = sum(energy[c] for c in laundry_children if c in energy)
-    if laundry_total > 0:
-        labels.append("Laundry"); parents.append(""); values.append(laundry_total)
-        for c in laundry_children:
-            if c in energy and energy[c] > 0:
-                labels.append(c); parents.append("Laundry"); values.append(energy[c])
-    # Entertainment
-    entertainment_children = ["TV", "Computer"]
-    entertainment_total = sum(energy[c] for c in entertainment_children if c in energy)
-    if entertainment_total > 0:
-        labels.append("Entertainment"); parents.append(""); values.append(entertainment_total)
-        for c in entertainment_children:
-            if c in energy and energy[c] > 0:
-                labels.append(c); parents.append("Entertainment"); values.append(energy[c])
-    # EV Charging
-    ev_children = ["EV Charger"]
-    ev_total = sum(energy[c] for c in ev_children if c in energy)
-    if ev_total > 0:
-        labels.append("EV Charging"); parents.append(""); values.append(ev_total)
-        for c in ev_children:
-            if c in energy and energy[c] > 0:
-                labels.append(c); parents.append("EV Charging"); values.append(energy[c])
-    # Other top-level (Lighting, etc.)
-    all_children = hvac_children + kitchen_children + laundry_children + entertainment_children + ev_children
-    for col in energy.index:
-        if col in all_children or col in ["Total", "Solar", "HVAC", "Kitchen", "Laundry", "Entertainment", "EV Charging"]:
-            continue
-        if energy[col] > 0:
-            labels.append(col); parents.append(""); values.append(energy[col])
-    fig = go.Figure(go.Sunburst(
+    return _sunburst_fig(df.sum() * timestep_hours)
+
+def _sunburst_fig(energy):
+    # energy: kWh per column, as a Series indexed by column name
+    labels, parents, values = [], [], []
+    # Each group with positive energy, followed by its positive children
+    for name, children in GROUPS:
+        child_energy = [energy.get(c, 0.0) for c in children]
+        total = sum(child_energy)
+        if total > 0:
+            labels.append(name)
+            parents.append("")
+            values.append(total)
+            for c, e in zip(children, child_energy):
+                if e > 0:
+                    labels.append(c)
+                    parents.append(name)
+                    values.append(e)
+    # Other positive subsystems (Lighting, etc.) at top level
+    others = energy[(energy > 0) & ~energy.index.isin(_NOT_TOP_LEVEL)]
+    labels.extend(others.index)
+    parents.extend([""] * len(others))
+    values.extend(others.to_numpy())
+    return go.Figure(go.Sunburst(
         labels=labels,
         parents=parents,
-        values=values,
+        # A float32 typed array is encoded compactly, unlike a list of Python floats
+        values=np.array(values, dtype=np.float32),
         branchvalues="total",
         maxdepth=3,
         hovertemplate='<b>%{label}</b><br>Energy: %{value:.2f} kWh<extra></extra>'
-    ))
-    fig.update_layout(title="Hierarchical Subsystem Energy Share (Sunburst)")
-    return fig
+    ), layout=_SUNBURST_LAYOUT)
+
+def build_all_figs(df, timestep_hours=1.0):
+    """
+    Returns the (time series, pie, sunburst, daily bar) figures for one simulation result,
+    sharing a single column-sum pass between the pie and sunburst charts.
+    """
+    energy = df.sum() * timestep_hours
+    return get_time_series_fig(df), _pie_fig(energy), _sunburst_fig(energy), get_daily_bar_fig(df, timestep_hours)
 
-# Example test visualization
+# Example test visualization (run as: python -m simulator.visualizer)
 if __name__ == "__main__":
-    import numpy as np
-    from simulator import BuildingSimulator
+    from .simulator import BuildingSimulator
+    from .models.hvac import HVACLoad
+    from .models.lighting import LightingLoad
+    from .models.appliances import ApplianceLoad
     np.random.seed(42)
     sim = BuildingSimulator()
-    from models.hvac import HVACLoad
-    from models.lighting import LightingLoad
-    from models.appliances import ApplianceLoad
     sim.add_load(HVACLoad("Chiller", 50, [1]*8 + [0]*8 + [1]*8), 'HVAC')
     sim.add_load(LightingLoad("Office", 3, [0]*7 + [1]*10 + [0]*7), 'Lighting')
     sim.add_load(ApplianceLoad("Pump", 4, [0]*6 + [1]*12 + [0]*6), 'Appliances')
     df = sim.run()
-    plot_time_series(df)
-    plot_pie_share(df)
-    plot_daily_bar(df) 
\ No newline at end of file
+    for fig in build_all_figs(df):
+        fig.show()
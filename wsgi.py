@@ -0,0 +1,13 @@
+# WSGI entry point for production serving, e.g.:
+#   gunicorn -w 4 -k gthread --threads 2 --preload wsgi:server
+# --preload imports the app once before forking, so all workers share its launch id and warmed cache
+# (without it each worker draws its own id and cache namespace).
+import os
+from uuid import uuid4
+from app import app, set_launch_uid, warmup_cache
+
+set_launch_uid(uuid4().hex)
+if os.environ.get("ENERGY_DASHBOARD_NO_WARMUP") != "1":
+    warmup_cache()
+
+server = app.server